@@ -1,16 +1,20 @@
 """
 FastAPI backend application for customer registration
 """
+import asyncio
 import logging
 import os
-from datetime import datetime
-from typing import Dict
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Dict, List
+from fastapi import Body, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from dotenv import load_dotenv
 
 from models.schemas import (
     AddressValidationRequest,
+    AddressResolutionResponse,
     GeocodingApiResponse,
     UtilityCompany,
     ConfirmationData,
@@ -25,16 +29,34 @@ load_dotenv()
 
 # Configure logging
 logging.basicConfig(
-    level=logging.INFO,
+    level=os.getenv("LOG_LEVEL", "WARNING").upper(),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared service resources on startup and release them on shutdown"""
+    if not SUBSCRIBER_INFO_PREFIX:
+        raise RuntimeError("SUBSCRIBER_KEY_PREFIX must be set")
+    await geocoding_service.startup()
+    await s3_service.startup()
+    await utility_service.preload()
+    try:
+        yield
+    finally:
+        await s3_service.shutdown()
+        await geocoding_service.shutdown()
+
+
 # Initialize FastAPI application
 app = FastAPI(
     title="Solar Landscape Demo",
     description="API for Solar Landscape customer registration",
-    version="0.0.1"
+    version="0.0.1",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -45,8 +67,9 @@ app.add_middleware(
         os.getenv("FRONTEND_URL", "http://localhost:5173")
     ],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type", "Authorization"],
+    max_age=86400,  # Let browsers cache preflight responses for a day
 )
 
 # Initialize services
@@ -56,15 +79,36 @@ s3_service = S3Service(
     bucket_name=os.getenv("AWS_S3_BUCKET_NAME"),
     aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
     aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-    region_name=os.getenv("AWS_REGION", "us-east-1")
+    region_name=os.getenv("AWS_REGION", "us-east-1"),
+    spool_dir=os.getenv(
+        "SUBSCRIBER_SPOOL_DIR",
+        "/var/cache/solar/subscriber-spool"
+    )
 )
 
 utility_service = UtilityService(
     s3_service=s3_service,
-    utilities_file_key=os.getenv("UTILITIES_FILE_KEY")
+    utilities_file_key=os.getenv("UTILITIES_FILE_KEY"),
+    local_cache_path=os.getenv(
+        "UTILITIES_CACHE_PATH",
+        "/var/cache/solar/utilities.json"
+    ),
+    local_cache_ttl=float(os.getenv("UTILITIES_CACHE_TTL", 86400))
 )
 
-SUBSCRIBER_INFO_FILE_KEY = os.getenv("SUBSCRIBER_FILE_KEY")
+# Prefix under which subscriber records are stored as NDJSON objects
+SUBSCRIBER_INFO_PREFIX = os.getenv("SUBSCRIBER_KEY_PREFIX")
+if not SUBSCRIBER_INFO_PREFIX and os.getenv("SUBSCRIBER_FILE_KEY"):
+    # Deployments configured before the NDJSON layout only set the file key
+    SUBSCRIBER_INFO_PREFIX = os.path.splitext(os.getenv("SUBSCRIBER_FILE_KEY"))[0]
+    logger.warning(
+        "SUBSCRIBER_FILE_KEY is deprecated; set SUBSCRIBER_KEY_PREFIX instead. "
+        "Using prefix %s",
+        SUBSCRIBER_INFO_PREFIX
+    )
+
+# Upper bound on addresses accepted by one batch validation request
+MAX_BATCH_ADDRESSES = 1000
 
 
 @app.get("/")
@@ -92,8 +136,8 @@ async def validate_address(request: AddressValidationRequest) -> GeocodingApiRes
     """
     try:
         logger.info(
-            f"Validating address: {request.address}, "
-            f"{request.city}, {request.state} {request.zip_code}"
+            "Validating address: %s, %s, %s %s",
+            request.address, request.city, request.state, request.zip_code
         )
         
         result = await geocoding_service.validate_address(
@@ -103,11 +147,42 @@ async def validate_address(request: AddressValidationRequest) -> GeocodingApiRes
             zip_code=request.zip_code
         )
         
-        logger.info(f"Address validation successful: {result.matched_address}")
+        logger.info("Address validation successful: %s", result.matched_address)
         return result
         
     except Exception as error:
-        logger.error(f"Address validation failed: {error}")
+        logger.error("Address validation failed: %s", error)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Address validation failed: {str(error)}"
+        )
+
+
+@app.post("/api/validate-addresses", response_model=List[GeocodingApiResponse])
+async def validate_addresses(
+    requests: List[AddressValidationRequest] = Body(
+        ..., min_length=1, max_length=MAX_BATCH_ADDRESSES
+    )
+) -> List[GeocodingApiResponse]:
+    """
+    Validate many addresses with a single US Census Bureau batch request
+    
+    Args:
+        requests: Address validation requests containing street, city, state, zip
+        
+    Returns:
+        GeocodingApiResponse for each address, in request order
+        
+    Raises:
+        HTTPException: If validation fails
+    """
+    try:
+        logger.info("Validating %s addresses", len(requests))
+        
+        return await geocoding_service.validate_addresses(requests)
+        
+    except Exception as error:
+        logger.error("Batch address validation failed: %s", error)
         raise HTTPException(
             status_code=500,
             detail=f"Address validation failed: {str(error)}"
@@ -129,21 +204,67 @@ async def get_utility_company(zip_code: str) -> UtilityCompany:
         HTTPException: If utility company cannot be found
     """
     try:
-        logger.info(f"Retrieving utility company for zip code: {zip_code}")
+        logger.info("Retrieving utility company for zip code: %s", zip_code)
         
         utility_company = await utility_service.get_utility_by_zip_code(zip_code)
         
-        logger.info(f"Found utility company: {utility_company.name}")
+        logger.info("Found utility company: %s", utility_company.name)
         return utility_company
         
     except Exception as error:
-        logger.error(f"Failed to retrieve utility company: {error}")
+        logger.error("Failed to retrieve utility company: %s", error)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to retrieve utility company: {str(error)}"
         )
 
 
+@app.post("/api/resolve", response_model=AddressResolutionResponse)
+async def resolve_address(request: AddressValidationRequest) -> AddressResolutionResponse:
+    """
+    Validate an address and retrieve its utility company in one request
+    
+    Both lookups run concurrently, so the form flow waits for the slower
+    of the two rather than their sum.
+    
+    Args:
+        request: Address validation request containing street, city, state, zip
+        
+    Returns:
+        AddressResolutionResponse with geocoding and utility company results
+        
+    Raises:
+        HTTPException: If either lookup fails
+    """
+    try:
+        logger.info(
+            "Resolving address: %s, %s, %s %s",
+            request.address, request.city, request.state, request.zip_code
+        )
+        
+        geocoding, utility_company = await asyncio.gather(
+            geocoding_service.validate_address(
+                address=request.address,
+                city=request.city,
+                state=request.state,
+                zip_code=request.zip_code
+            ),
+            utility_service.get_utility_by_zip_code(request.zip_code)
+        )
+        
+        return AddressResolutionResponse(
+            geocoding=geocoding,
+            utilityCompany=utility_company
+        )
+        
+    except Exception as error:
+        logger.error("Address resolution failed: %s", error)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Address resolution failed: {str(error)}"
+        )
+
+
 @app.post("/api/submit-subscriber", response_model=SubmissionResponse)
 async def submit_subscriber(data: ConfirmationData) -> SubmissionResponse:
     """
@@ -160,32 +281,19 @@ async def submit_subscriber(data: ConfirmationData) -> SubmissionResponse:
     """
     try:
         logger.info(
-            f"Submitting subscriber: "
-            f"{data.user_info.first_name} {data.user_info.last_name}"
+            "Submitting subscriber: %s %s",
+            data.user_info.first_name, data.user_info.last_name
         )
         
         # Prepare submission data with timestamp
         submission_record = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "user_info": {
-                "first_name": data.user_info.first_name,
-                "last_name": data.user_info.last_name,
-                "address": data.user_info.address,
-                "city": data.user_info.city,
-                "state": data.user_info.state,
-                "zip_code": data.user_info.zip_code
-            },
-            "recommended_address": data.recommended_address,
-            "utility_company": {
-                "name": data.utility_company.name,
-                "zip_code": data.utility_company.zip_code
-            },
-            "assistance_program": data.assistance_program
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            **data.model_dump()
         }
         
-        # Append to S3 file
-        await s3_service.append_to_json_array(
-            SUBSCRIBER_INFO_FILE_KEY,
+        # Append to S3 storage
+        await s3_service.append_json_line(
+            SUBSCRIBER_INFO_PREFIX,
             submission_record
         )
         
@@ -197,7 +305,7 @@ async def submit_subscriber(data: ConfirmationData) -> SubmissionResponse:
         )
         
     except Exception as error:
-        logger.error(f"Failed to submit subscriber information: {error}")
+        logger.error("Failed to submit subscriber information: %s", error)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to submit information: {str(error)}"
@@ -214,7 +322,7 @@ async def clear_utility_cache() -> Dict[str, str]:
         utility_service.clear_cache()
         return {"status": "success", "message": "Utility cache cleared"}
     except Exception as error:
-        logger.error(f"Failed to clear cache: {error}")
+        logger.error("Failed to clear cache: %s", error)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to clear cache: {str(error)}"
@@ -225,11 +333,20 @@ if __name__ == "__main__":
     import uvicorn
     
     port = int(os.getenv("PORT", 8000))
+    is_dev = os.getenv("ENV") == "dev"
+    
+    # Auto-reload only supports a single worker, so keep it to development
+    workers = 1 if is_dev else int(
+        os.getenv("WEB_CONCURRENCY", (os.cpu_count() or 1) * 2 + 1)
+    )
     
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=port,
-        reload=True,
+        loop="auto",  # uvloop when installed, asyncio otherwise
+        http="httptools",
+        workers=workers,
+        reload=is_dev,
         log_level="info"
-    )
\ No newline at end of file
+    )
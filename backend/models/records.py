@@ -0,0 +1,17 @@
+"""
+msgspec structs for internal data decoded outside the API boundary
+"""
+from typing import Optional, Union
+import msgspec
+
+
+class UtilityRecord(msgspec.Struct, frozen=True):
+    """
+    Entry in the utilities JSON file stored in S3
+    
+    Rows are decoded one at a time, so a row that does not fit this struct
+    is skipped without failing the whole file; rows without a usable label
+    or post code are skipped on load.
+    """
+    button_label: Optional[str] = None
+    post_code: Union[str, int, None] = None
@@ -1,7 +1,7 @@
 """
 Pydantic models for request/response validation
 """
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 class AddressValidationRequest(BaseModel):
@@ -11,13 +11,13 @@ class AddressValidationRequest(BaseModel):
     state: str = Field(..., min_length=2, max_length=2, description="2-letter state code")
     zip_code: str = Field(..., alias="zipCode", description="5 or 9 digit zip code")
 
-    @validator('state')
+    @field_validator('state')
+    @classmethod
     def validate_state_code(cls, value):
         """Ensure state is uppercase 2-letter code"""
         return value.upper()
 
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class Coordinates(BaseModel):
@@ -32,8 +32,7 @@ class GeocodingApiResponse(BaseModel):
     coordinates: Coordinates
     is_valid: bool = Field(..., alias="isValid")
 
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class UtilityCompany(BaseModel):
@@ -41,8 +40,15 @@ class UtilityCompany(BaseModel):
     name: str
     zip_code: str = Field(..., alias="zipCode")
 
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class AddressResolutionResponse(BaseModel):
+    """Combined geocoding and utility company lookup for an address"""
+    geocoding: GeocodingApiResponse
+    utility_company: UtilityCompany = Field(..., alias="utilityCompany")
+
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class UserFormData(BaseModel):
@@ -54,8 +60,7 @@ class UserFormData(BaseModel):
     state: str
     zip_code: str = Field(..., alias="zipCode")
 
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class ConfirmationData(BaseModel):
@@ -65,7 +70,8 @@ class ConfirmationData(BaseModel):
     utility_company: UtilityCompany = Field(..., alias="utilityCompany")
     assistance_program: str = Field(..., alias="assistanceProgram")
 
-    @validator('assistance_program')
+    @field_validator('assistance_program')
+    @classmethod
     def validate_assistance_program(cls, value):
         """Ensure assistance program is one of the allowed values"""
         allowed_values = ['SNAP', 'Medicare', 'None']
@@ -73,8 +79,7 @@ class ConfirmationData(BaseModel):
             raise ValueError(f'Assistance program must be one of {allowed_values}')
         return value
 
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class SubmissionResponse(BaseModel):
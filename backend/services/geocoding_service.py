@@ -1,22 +1,76 @@
 """
 Service for interacting with US Census Bureau Geocoding API
 """
+import asyncio
+import csv
+import io
 import logging
-from typing import Dict, Optional
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
 import httpx
-from models.schemas import GeocodingApiResponse, Coordinates
+from models.schemas import (
+    AddressValidationRequest,
+    GeocodingApiResponse,
+    Coordinates
+)
 
 logger = logging.getLogger(__name__)
 
 CENSUS_GEOCODING_BASE_URL = "https://geocoding.geo.census.gov/geocoder"
 
+# Query parameters shared by every Census geocoding request
+CENSUS_BASE_PARAMS = {
+    "benchmark": "Public_AR_Current",  # Current benchmark
+    "format": "json"
+}
+
+# The batch endpoint accepts at most 10,000 addresses per file
+CENSUS_BATCH_MAX_SIZE = 10_000
+# Large batch files take minutes for Census to process
+CENSUS_BATCH_TIMEOUT = httpx.Timeout(10.0, read=600.0)
+# Limit on concurrent single-address lookups for rows the batch did not resolve
+CENSUS_MAX_CONCURRENT_LOOKUPS = 10
+
+GEOCODING_CACHE_MAX_SIZE = 10_000
+GEOCODING_CACHE_TTL = 86400  # seconds
+GEOCODING_NO_MATCH_CACHE_TTL = 3600  # seconds
+
 
 class GeocodingService:
     """Service to validate addresses using Census Bureau Geocoding API"""
 
     def __init__(self):
         self.base_url = CENSUS_GEOCODING_BASE_URL
+        # Census Bureau Geocoding API endpoint
+        # Using the "onelineaddress" format for simplicity
+        self.oneline_address_url = f"{self.base_url}/locations/onelineaddress"
+        self.address_batch_url = f"{self.base_url}/locations/addressbatch"
         self.timeout = 10.0  # seconds
+        self._client: Optional[httpx.AsyncClient] = None
+        # Normalized address key -> (expiry time, response), oldest first
+        self.cache_max_size = GEOCODING_CACHE_MAX_SIZE
+        self._cache: "OrderedDict[str, Tuple[float, GeocodingApiResponse]]" = (
+            OrderedDict()
+        )
+
+    async def startup(self) -> None:
+        """Open the shared HTTP client so connections are reused across requests"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                http2=True,
+                limits=httpx.Limits(
+                    max_keepalive_connections=32,
+                    keepalive_expiry=60
+                )
+            )
+
+    async def shutdown(self) -> None:
+        """Close the shared HTTP client and release pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def validate_address(
         self,
@@ -40,51 +94,345 @@ class GeocodingService:
         Raises:
             HTTPException: If the API call fails or address cannot be validated
         """
+        # Construct the full address string
+        full_address = self._full_address(address, city, state, zip_code)
+
+        cache_key = self._cache_key(address, city, state, zip_code)
+        cached = self._get_cached(cache_key, full_address)
+        if cached is not None:
+            return cached
+
         try:
-            # Construct the full address string
-            full_address = f"{address}, {city}, {state} {zip_code}"
-            
-            # Census Bureau Geocoding API endpoint
-            # Using the "onelineaddress" format for simplicity
-            url = f"{self.base_url}/locations/onelineaddress"
-            
-            params = {
-                "address": full_address,
-                "benchmark": "Public_AR_Current",  # Current benchmark
-                "format": "json"
-            }
-
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                # Parse the response
-                matched_address, coordinates = self._parse_census_response(data)
+
+            if self._client is None:
+                await self.startup()
+
+            response = await self._client.get(
+                self.oneline_address_url,
+                params={**CENSUS_BASE_PARAMS, "address": full_address}
+            )
+            response.raise_for_status()
+            
+            data = response.json()
+            
+            # Parse the response
+            matched_address, coordinates = self._parse_census_response(data)
+            
+            return self._build_result(
+                cache_key, full_address, matched_address, coordinates
+            )
                 
-                if not matched_address:
-                    logger.warning(f"No match found for address: {full_address}")
-                    # Return original address if no match found
-                    return GeocodingApiResponse(
-                        matchedAddress=full_address,
-                        coordinates=Coordinates(latitude=0.0, longitude=0.0),
-                        isValid=False
-                    )
+        except httpx.HTTPError as error:
+            logger.error("HTTP error during geocoding: %s", error)
+            raise Exception(f"Failed to validate address: {str(error)}")
+        except Exception as error:
+            logger.error("Unexpected error during geocoding: %s", error)
+            raise Exception(f"Address validation failed: {str(error)}")
+
+    async def validate_addresses(
+        self,
+        requests: List[AddressValidationRequest]
+    ) -> List[GeocodingApiResponse]:
+        """
+        Validate many addresses using the Census Bureau batch Geocoding API
+        
+        Cached addresses are answered directly; the rest are sent in as few
+        batch requests as possible instead of one request per address.
+        
+        Args:
+            requests: Addresses to validate
+            
+        Returns:
+            GeocodingApiResponse for each address, in request order
+            
+        Raises:
+            Exception: If the API call fails
+        """
+        results: List[Optional[GeocodingApiResponse]] = [None] * len(requests)
+        pending: List[Tuple[int, str, AddressValidationRequest]] = []
+        
+        for index, request in enumerate(requests):
+            cache_key = self._cache_key(
+                request.address, request.city, request.state, request.zip_code
+            )
+            full_address = self._full_address(
+                request.address, request.city, request.state, request.zip_code
+            )
+            cached = self._get_cached(cache_key, full_address)
+            if cached is not None:
+                results[index] = cached
+            else:
+                pending.append((index, cache_key, request))
+        
+        try:
+            for start in range(0, len(pending), CENSUS_BATCH_MAX_SIZE):
+                chunk = pending[start:start + CENSUS_BATCH_MAX_SIZE]
+                matches, no_matches = await self._geocode_batch(chunk)
                 
-                return GeocodingApiResponse(
-                    matchedAddress=matched_address,
-                    coordinates=coordinates,
-                    isValid=True
+                # Ties have no candidates in the batch output, and rows that
+                # are missing or failed to parse have no answer at all, so look
+                # them up individually rather than caching them as no match
+                unresolved = [
+                    entry for entry in chunk
+                    if entry[0] not in matches and entry[0] not in no_matches
+                ]
+                lookup_results = await self._validate_individually(
+                    [request for _, _, request in unresolved]
                 )
+                for (index, _, _), result in zip(unresolved, lookup_results):
+                    results[index] = result
                 
+                for index, cache_key, request in chunk:
+                    full_address = self._full_address(
+                        request.address, request.city, request.state, request.zip_code
+                    )
+                    if index in matches:
+                        matched_address, coordinates = matches[index]
+                        results[index] = self._build_result(
+                            cache_key, full_address, matched_address, coordinates
+                        )
+                    elif index in no_matches:
+                        results[index] = self._build_result(
+                            cache_key, full_address, None,
+                            Coordinates(latitude=0.0, longitude=0.0)
+                        )
+            
+            return results
+            
         except httpx.HTTPError as error:
-            logger.error(f"HTTP error during geocoding: {error}")
-            raise Exception(f"Failed to validate address: {str(error)}")
+            logger.error("HTTP error during batch geocoding: %s", error)
+            raise Exception(f"Failed to validate addresses: {str(error)}")
         except Exception as error:
-            logger.error(f"Unexpected error during geocoding: {error}")
+            logger.error("Unexpected error during batch geocoding: %s", error)
             raise Exception(f"Address validation failed: {str(error)}")
 
+    async def _validate_individually(
+        self,
+        requests: List[AddressValidationRequest]
+    ) -> List[GeocodingApiResponse]:
+        """
+        Validate addresses one at a time, a bounded number concurrently
+        
+        Args:
+            requests: Addresses to validate
+            
+        Returns:
+            GeocodingApiResponse for each address, in request order
+        """
+        semaphore = asyncio.Semaphore(CENSUS_MAX_CONCURRENT_LOOKUPS)
+        
+        async def validate(request: AddressValidationRequest) -> GeocodingApiResponse:
+            async with semaphore:
+                return await self.validate_address(
+                    address=request.address,
+                    city=request.city,
+                    state=request.state,
+                    zip_code=request.zip_code
+                )
+        
+        return await asyncio.gather(*[validate(request) for request in requests])
+
+    async def _geocode_batch(
+        self,
+        batch: List[Tuple[int, str, AddressValidationRequest]]
+    ) -> Tuple[Dict[int, Tuple[str, Coordinates]], Set[int]]:
+        """
+        Send one batch of addresses to the Census Bureau batch endpoint
+        
+        Args:
+            batch: List of (index, cache_key, request) entries to geocode
+            
+        Returns:
+            Tuple of (index -> (matched_address, coordinates) for matches,
+            indexes of addresses Census reported as having no match)
+        """
+        # Census expects a header-less CSV of: Unique ID, Street, City, State, ZIP
+        address_file = io.StringIO()
+        writer = csv.writer(address_file)
+        for index, _, request in batch:
+            writer.writerow([
+                index,
+                request.address,
+                request.city,
+                request.state,
+                request.zip_code
+            ])
+
+        if self._client is None:
+            await self.startup()
+
+        response = await self._client.post(
+            self.address_batch_url,
+            data={"benchmark": CENSUS_BASE_PARAMS["benchmark"]},
+            files={
+                "addressFile": ("addresses.csv", address_file.getvalue(), "text/csv")
+            },
+            timeout=CENSUS_BATCH_TIMEOUT
+        )
+        response.raise_for_status()
+        
+        return self._parse_census_batch_response(response.text)
+
+    def _parse_census_batch_response(
+        self,
+        content: str
+    ) -> Tuple[Dict[int, Tuple[str, Coordinates]], Set[int]]:
+        """
+        Parse the CSV returned by the Census Bureau batch endpoint
+        
+        Rows are: ID, input address, match status, match type,
+        matched address, "longitude,latitude", TIGER line ID, side
+        
+        Args:
+            content: CSV response body
+            
+        Returns:
+            Tuple of (index -> (matched_address, coordinates) for matches,
+            indexes of addresses Census reported as having no match).
+            Ties and rows that fail to parse appear in neither.
+        """
+        matches: Dict[int, Tuple[str, Coordinates]] = {}
+        no_matches: Set[int] = set()
+        
+        for row in csv.reader(io.StringIO(content)):
+            try:
+                if len(row) >= 3 and row[2] == "No_Match":
+                    no_matches.add(int(row[0]))
+                    continue
+                if len(row) < 6 or row[2] != "Match":
+                    continue
+                
+                longitude, latitude = row[5].split(",")
+                matches[int(row[0])] = (
+                    row[4],
+                    Coordinates(
+                        latitude=float(latitude),
+                        longitude=float(longitude)
+                    )
+                )
+                
+            except (IndexError, ValueError) as error:
+                logger.error("Error parsing Census batch response row: %s", error)
+        
+        return matches, no_matches
+
+    def _build_result(
+        self,
+        cache_key: str,
+        full_address: str,
+        matched_address: Optional[str],
+        coordinates: Coordinates
+    ) -> GeocodingApiResponse:
+        """
+        Build and cache the response for a geocoded address
+        
+        Args:
+            cache_key: Normalized address key
+            full_address: Address as submitted
+            matched_address: Census matched address, or None if no match
+            coordinates: Coordinates of the match
+            
+        Returns:
+            GeocodingApiResponse for the address
+        """
+        if not matched_address:
+            logger.warning("No match found for address: %s", full_address)
+            result = self._no_match_result(full_address)
+            self._set_cached(cache_key, result, GEOCODING_NO_MATCH_CACHE_TTL)
+            return result
+        
+        result = GeocodingApiResponse(
+            matchedAddress=matched_address,
+            coordinates=coordinates,
+            isValid=True
+        )
+        self._set_cached(cache_key, result, GEOCODING_CACHE_TTL)
+        return result
+
+    def _full_address(
+        self,
+        address: str,
+        city: str,
+        state: str,
+        zip_code: str
+    ) -> str:
+        """Build the one-line address string sent to the Census API"""
+        return f"{address}, {city}, {state} {zip_code}"
+
+    def _no_match_result(self, full_address: str) -> GeocodingApiResponse:
+        """Build the response for an address with no Census match"""
+        # Return original address if no match found
+        return GeocodingApiResponse(
+            matchedAddress=full_address,
+            coordinates=Coordinates(latitude=0.0, longitude=0.0),
+            isValid=False
+        )
+
+    def _cache_key(
+        self,
+        address: str,
+        city: str,
+        state: str,
+        zip_code: str
+    ) -> str:
+        """Build a normalized cache key for an address"""
+        return (
+            f"{address.strip().lower()}|{city.strip().lower()}|"
+            f"{state.strip().upper()}|{zip_code.strip()[:5]}"
+        )
+
+    def _get_cached(
+        self,
+        cache_key: str,
+        full_address: str
+    ) -> Optional[GeocodingApiResponse]:
+        """
+        Look up a cached geocoding result
+        
+        Only the outcome of a no-match is shared between callers; its
+        response is rebuilt from the current caller's address, since inputs
+        that normalize to the same key can still differ in text or ZIP+4.
+        
+        Args:
+            cache_key: Normalized address key
+            full_address: Address as submitted by the current caller
+            
+        Returns:
+            Cached response, or None if missing or expired
+        """
+        entry = self._cache.get(cache_key)
+        if entry is None:
+            return None
+        
+        expires_at, result = entry
+        if expires_at < time.monotonic():
+            del self._cache[cache_key]
+            return None
+        
+        self._cache.move_to_end(cache_key)
+        if not result.is_valid:
+            return self._no_match_result(full_address)
+        return result
+
+    def _set_cached(
+        self,
+        cache_key: str,
+        result: GeocodingApiResponse,
+        ttl: float
+    ) -> None:
+        """
+        Cache a geocoding result, evicting the least recently used entry if full
+        
+        Args:
+            cache_key: Normalized address key
+            result: Response to cache
+            ttl: Seconds until the entry expires
+        """
+        self._cache[cache_key] = (time.monotonic() + ttl, result)
+        self._cache.move_to_end(cache_key)
+        if len(self._cache) > self.cache_max_size:
+            self._cache.popitem(last=False)
+
     def _parse_census_response(
         self, 
         data: Dict
@@ -125,5 +473,5 @@ class GeocodingService:
             return matched_address, coordinates
             
         except (KeyError, ValueError, TypeError) as error:
-            logger.error(f"Error parsing Census API response: {error}")
+            logger.error("Error parsing Census API response: %s", error)
             return None, Coordinates(latitude=0.0, longitude=0.0)
\ No newline at end of file
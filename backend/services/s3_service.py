@@ -1,14 +1,33 @@
 """
 Service for interacting with AWS S3 storage
 """
-import json
+import asyncio
 import logging
-from typing import Dict, Any
-import boto3
+import os
+import uuid
+from contextlib import AsyncExitStack
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Tuple
+import aioboto3
+import orjson
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 logger = logging.getLogger(__name__)
 
+QueueEntry = Tuple[str, Dict[str, Any]]
+
+DEFAULT_MAX_BATCH_SIZE = 1000
+DEFAULT_FLUSH_INTERVAL = 10.0  # seconds
+MAX_RETRY_DELAY = 300.0  # seconds
+
+# Keep a warm pool of connections to S3 so TLS sessions are reused
+S3_CLIENT_CONFIG = Config(
+    max_pool_connections=64,
+    tcp_keepalive=True,
+    retries={'mode': 'adaptive', 'max_attempts': 3}
+)
+
 
 class S3Service:
     """Service for reading from and writing to AWS S3"""
@@ -18,7 +37,10 @@ class S3Service:
         bucket_name: str,
         aws_access_key_id: str = None,
         aws_secret_access_key: str = None,
-        region_name: str = "us-east-1"
+        region_name: str = "us-east-1",
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        spool_dir: Optional[str] = None
     ):
         """
         Initialize S3 service
@@ -28,128 +50,362 @@ class S3Service:
             aws_access_key_id: AWS access key (optional, uses IAM role if not provided)
             aws_secret_access_key: AWS secret key (optional)
             region_name: AWS region name
+            max_batch_size: Maximum number of queued items written per flush
+            flush_interval: Seconds to wait for more items before flushing
+            spool_dir: Local directory for items that could not be written to
+                S3 by shutdown; they are replayed on the next startup (optional)
         """
         self.bucket_name = bucket_name
         
-        # Initialize S3 client
+        # Initialize S3 session
         if aws_access_key_id and aws_secret_access_key:
-            self.s3_client = boto3.client(
-                's3',
+            self._session = aioboto3.Session(
                 aws_access_key_id=aws_access_key_id,
                 aws_secret_access_key=aws_secret_access_key,
                 region_name=region_name
             )
         else:
             # Use default credentials (IAM role, environment variables, etc.)
-            self.s3_client = boto3.client('s3', region_name=region_name)
+            self._session = aioboto3.Session(region_name=region_name)
+        
+        self._exit_stack: Optional[AsyncExitStack] = None
+        self.s3_client = None
+        
+        # Buffered appends, flushed to S3 in batches by a background task
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.spool_dir = spool_dir
+        # Entries are (prefix, item); None stops the flush task
+        self._queue: "asyncio.Queue[Optional[QueueEntry]]" = asyncio.Queue()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+        self._retry_delay = 0.0
+
+    async def startup(self) -> None:
+        """Open the shared S3 client and start the background flush task"""
+        if self.s3_client is None:
+            self._exit_stack = AsyncExitStack()
+            self.s3_client = await self._exit_stack.enter_async_context(
+                self._session.client('s3', config=S3_CLIENT_CONFIG)
+            )
+        if self._flush_task is None:
+            self._stopping.clear()
+            for entry in await asyncio.to_thread(self._read_spool):
+                self._queue.put_nowait(entry)
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def shutdown(self) -> None:
+        """Flush pending appends and close the shared S3 client"""
+        if self._flush_task is not None:
+            # Let the flush task write its current batch and exit on its own
+            self._stopping.set()
+            await self._queue.put(None)
+            try:
+                await self._flush_task
+            except Exception as error:
+                logger.error("Flush task failed: %s", error)
+            self._flush_task = None
+        try:
+            await self.flush()
+        except Exception as error:
+            logger.error("Error flushing queued items on shutdown: %s", error)
+        if self._exit_stack is not None:
+            await self._exit_stack.aclose()
+            self._exit_stack = None
+            self.s3_client = None
 
-    async def read_json_file(self, file_key: str) -> Dict[str, Any]:
+    async def read_file(self, file_key: str) -> Optional[bytes]:
         """
-        Read a JSON file from S3
+        Read the raw contents of a file from S3
         
         Args:
             file_key: S3 object key (file path in bucket)
             
         Returns:
-            Parsed JSON data as dictionary
+            File contents as bytes, or None if the file doesn't exist
             
         Raises:
-            Exception: If file cannot be read or parsed
+            Exception: If file cannot be read
         """
         try:
-            response = self.s3_client.get_object(
+            if self.s3_client is None:
+                await self.startup()
+
+            response = await self.s3_client.get_object(
                 Bucket=self.bucket_name,
                 Key=file_key
             )
             
-            content = response['Body'].read().decode('utf-8')
-            data = json.loads(content)
+            async with response['Body'] as stream:
+                content = await stream.read()
             
-            logger.info(f"Successfully read {file_key} from S3")
-            return data
+            logger.info("Successfully read %s from S3", file_key)
+            return content
             
         except ClientError as error:
             if error.response['Error']['Code'] == 'NoSuchKey':
-                logger.warning(f"File not found in S3: {file_key}")
-                # Return empty structure if file doesn't exist
-                return {}
+                logger.warning("File not found in S3: %s", file_key)
+                return None
             else:
-                logger.error(f"Error reading from S3: {error}")
+                logger.error("Error reading from S3: %s", error)
                 raise Exception(f"Failed to read file from S3: {str(error)}")
-        except json.JSONDecodeError as error:
-            logger.error(f"Error parsing JSON from S3: {error}")
-            raise Exception(f"Invalid JSON in S3 file: {str(error)}")
 
-    async def write_json_file(
+    async def append_json_line(
         self,
-        file_key: str,
-        data: Dict[str, Any]
+        prefix: str,
+        new_item: Dict[str, Any]
     ) -> None:
         """
-        Write a JSON file to S3
+        Queue an item to be appended as a JSON line under an S3 prefix
+        Queued items are written in batches by the background flush task,
+        each batch as a new newline-delimited JSON object under the prefix
         
         Args:
-            file_key: S3 object key (file path in bucket)
-            data: Data to write as JSON
+            prefix: S3 key prefix to append under
+            new_item: Item to append
             
         Raises:
-            Exception: If file cannot be written
+            ValueError: If no prefix is given
+        """
+        if not prefix:
+            raise ValueError("An S3 key prefix is required to append items")
+        if self._flush_task is None:
+            await self.startup()
+        await self._queue.put((prefix, new_item))
+
+    async def flush(self) -> None:
+        """
+        Write every currently queued item to S3
+        
+        Items that still cannot be written are spooled to local disk when a
+        spool directory is configured.
+        
+        Raises:
+            Exception: If items could be neither written nor spooled
+        """
+        batch = []
+        while not self._queue.empty():
+            entry = self._queue.get_nowait()
+            if entry is not None:
+                batch.append(entry)
+        if batch:
+            failed = await self._write_batch(batch)
+            if failed and not await asyncio.to_thread(self._write_spool, failed):
+                raise Exception(f"Failed to flush {len(failed)} queued items to S3")
+
+    async def _flush_loop(self) -> None:
+        """
+        Background task that collects queued items and writes them to S3
+        
+        A batch is written once it reaches max_batch_size items or
+        flush_interval seconds have passed since its first item arrived.
+        Failed items are re-queued and retried with exponential backoff,
+        never dropped. The task exits after writing its batch once it
+        receives None.
+        """
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            batch: List[QueueEntry] = []
+            try:
+                entry = await self._queue.get()
+                if entry is None:
+                    break
+                batch.append(entry)
+                deadline = loop.time() + self.flush_interval
+                
+                while len(batch) < self.max_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        entry = await asyncio.wait_for(
+                            self._queue.get(), timeout=timeout
+                        )
+                    except asyncio.TimeoutError:
+                        break
+                    if entry is None:
+                        stopping = True
+                        break
+                    batch.append(entry)
+                
+                failed = await self._write_batch(batch)
+                for entry in failed:
+                    self._queue.put_nowait(entry)
+                
+                if failed:
+                    self._retry_delay = min(
+                        max(self._retry_delay * 2, self.flush_interval),
+                        MAX_RETRY_DELAY
+                    )
+                    logger.warning(
+                        "Retrying %s items in %s seconds",
+                        len(failed), self._retry_delay
+                    )
+                    await self._wait_for_stop(self._retry_delay)
+                else:
+                    self._retry_delay = 0.0
+                
+            except asyncio.CancelledError:
+                # Put collected items back so a later flush can still write them
+                for entry in batch:
+                    self._queue.put_nowait(entry)
+                raise
+
+    async def _wait_for_stop(self, delay: float) -> None:
+        """
+        Sleep for a retry delay, returning early if shutdown has started
+        
+        Args:
+            delay: Maximum seconds to wait
         """
         try:
-            json_content = json.dumps(data, indent=2, ensure_ascii=False)
-            
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=file_key,
-                Body=json_content.encode('utf-8'),
-                ContentType='application/json'
-            )
-            
-            logger.info(f"Successfully wrote {file_key} to S3")
-            
-        except ClientError as error:
-            logger.error(f"Error writing to S3: {error}")
-            raise Exception(f"Failed to write file to S3: {str(error)}")
+            await asyncio.wait_for(self._stopping.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
 
-    async def append_to_json_array(
-        self,
-        file_key: str,
-        new_item: Dict[str, Any]
-    ) -> None:
+    def _write_spool(self, entries: List[QueueEntry]) -> bool:
         """
-        Append an item to a JSON array file in S3
-        If the file doesn't exist, creates it with the new item
+        Save unsent items to a new file in the spool directory
         
         Args:
-            file_key: S3 object key (file path in bucket)
-            new_item: Item to append to the array
+            entries: Entries that could not be written to S3
             
-        Raises:
-            Exception: If operation fails
+        Returns:
+            True if the entries were saved
         """
+        if not self.spool_dir:
+            return False
+        
         try:
-            # Read existing data
-            existing_data = await self.read_json_file(file_key)
+            os.makedirs(self.spool_dir, exist_ok=True)
+            spool_path = os.path.join(self.spool_dir, f"{uuid.uuid4().hex}.ndjson")
             
-            # If file is empty or doesn't exist, initialize as array
-            if not existing_data:
-                existing_data = []
+            # Write to a temporary file first so replay never sees a partial file
+            temp_path = f"{spool_path}.tmp"
+            with open(temp_path, "wb") as spool_file:
+                for prefix, item in entries:
+                    spool_file.write(orjson.dumps(
+                        {"prefix": prefix, "item": item},
+                        option=orjson.OPT_APPEND_NEWLINE
+                    ))
+                spool_file.flush()
+                os.fsync(spool_file.fileno())
+            os.replace(temp_path, spool_path)
             
-            # Ensure we have a list
-            if not isinstance(existing_data, list):
-                logger.warning(
-                    f"File {file_key} is not an array, converting to array"
-                )
-                existing_data = [existing_data]
+            logger.warning("Spooled %s unsent items to %s", len(entries), spool_path)
+            return True
+            
+        except OSError as error:
+            logger.error("Failed to spool unsent items: %s", error)
+            return False
+
+    def _read_spool(self) -> List[QueueEntry]:
+        """
+        Load and remove the items left in the spool directory
+        
+        Each file is renamed before it is read, so when several workers start
+        together only one of them replays it.
+        
+        Returns:
+            Spooled entries, to be queued again
+        """
+        if not self.spool_dir:
+            return []
+        
+        try:
+            file_names = sorted(os.listdir(self.spool_dir))
+        except OSError:
+            return []
+        
+        entries: List[QueueEntry] = []
+        for file_name in file_names:
+            if not file_name.endswith(".ndjson"):
+                continue
             
-            # Append new item
-            existing_data.append(new_item)
+            spool_path = os.path.join(self.spool_dir, file_name)
+            claimed_path = f"{spool_path}.{os.getpid()}.replay"
+            try:
+                os.rename(spool_path, claimed_path)
+            except OSError:
+                # Already claimed by another worker
+                continue
             
-            # Write back to S3
-            await self.write_json_file(file_key, existing_data)
+            with open(claimed_path, "rb") as spool_file:
+                for line in spool_file:
+                    if not line.strip():
+                        continue
+                    try:
+                        record = orjson.loads(line)
+                        entries.append((record["prefix"], record["item"]))
+                    except (orjson.JSONDecodeError, KeyError, TypeError) as error:
+                        logger.error("Skipping invalid spooled item: %s", error)
+            os.remove(claimed_path)
+        
+        if entries:
+            logger.info("Replaying %s spooled items", len(entries))
+        return entries
+
+    async def _write_batch(
+        self,
+        batch: List[QueueEntry]
+    ) -> List[QueueEntry]:
+        """
+        Write a batch of queued items to S3 as newline-delimited JSON
+        Each prefix gets one new object, so existing data is never rewritten
+        
+        Args:
+            batch: List of (prefix, item) entries
             
-            logger.info(f"Successfully appended item to {file_key}")
+        Returns:
+            The entries that could not be written
+        """
+        failed: List[QueueEntry] = []
+        entries_by_prefix: Dict[str, List[QueueEntry]] = {}
+        for entry in batch:
+            entries_by_prefix.setdefault(entry[0], []).append(entry)
+        
+        for prefix, entries in entries_by_prefix.items():
+            new_items = [item for _, item in entries]
+            try:
+                if self.s3_client is None:
+                    await self.startup()
+
+                body = b"".join(
+                    orjson.dumps(item, option=orjson.OPT_APPEND_NEWLINE)
+                    for item in new_items
+                )
+                file_key = self._json_lines_key(prefix)
+                
+                await self.s3_client.put_object(
+                    Bucket=self.bucket_name,
+                    Key=file_key,
+                    Body=body,
+                    ContentType='application/x-ndjson'
+                )
+                
+                logger.info(
+                    "Successfully appended %s items to %s", len(new_items), file_key
+                )
+                
+            except Exception as error:
+                logger.error("Error appending JSON lines: %s", error)
+                failed.extend(entries)
+        
+        return failed
+
+    def _json_lines_key(self, prefix: str) -> str:
+        """
+        Build a unique, time-ordered object key for a batch of JSON lines
+        
+        Args:
+            prefix: S3 key prefix
             
-        except Exception as error:
-            logger.error(f"Error appending to JSON array: {error}")
-            raise Exception(f"Failed to append to JSON file: {str(error)}")
\ No newline at end of file
+        Returns:
+            Key of the form prefix/YYYY/MM/DD/<timestamp>-<uuid>.ndjson
+        """
+        now = datetime.now(timezone.utc)
+        return (
+            f"{prefix.rstrip('/')}/{now:%Y/%m/%d}/"
+            f"{now:%Y%m%dT%H%M%S%fZ}-{uuid.uuid4().hex}.ndjson"
+        )
@@ -1,8 +1,16 @@
 """
 Service for managing utility company information
 """
+import asyncio
 import logging
-from typing import Dict, Optional
+import mmap
+import os
+import re
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional
+import msgspec
+from models.records import UtilityRecord
 from models.schemas import UtilityCompany
 from services.s3_service import S3Service
 
@@ -16,21 +24,58 @@ ALLOWED_UTILITY_COS = [
     "ACE"
 ]
 
+DEFAULT_LOCAL_CACHE_TTL = 86400  # seconds
+
+NON_DIGIT_PATTERN = re.compile(r"\D")
+
 
 class UtilityService:
     """Service for retrieving utility company information by zip code"""
 
-    def __init__(self, s3_service: S3Service, utilities_file_key: str):
+    def __init__(
+        self,
+        s3_service: S3Service,
+        utilities_file_key: str,
+        local_cache_path: Optional[str] = None,
+        local_cache_ttl: float = DEFAULT_LOCAL_CACHE_TTL
+    ):
         """
         Initialize utility service
         
         Args:
             s3_service: Instance of S3Service for data access
             utilities_file_key: S3 key for the utilities JSON file
+            local_cache_path: Local file mirroring the utilities file (optional)
+            local_cache_ttl: Seconds before the local mirror is refetched from S3
         """
         self.s3_service = s3_service
         self.utilities_file_key = utilities_file_key
-        self._utilities_cache: Optional[Dict[str, Dict]] = None
+        self.local_cache_path = local_cache_path
+        self.local_cache_ttl = local_cache_ttl
+        # Sorted zip codes with utility names at matching indexes
+        self._zip_codes: Optional[List[str]] = None
+        self._utility_names: Optional[List[str]] = None
+        self._load_lock = asyncio.Lock()
+        # Set by clear_cache so the next load goes to S3 instead of the mirror
+        self._bypass_local_cache = False
+        # When the cache was loaded, and the mirror's mtime at that point;
+        # lets every worker notice a reload done by another worker
+        self._loaded_at = 0.0
+        self._loaded_mirror_mtime: Optional[float] = None
+
+    async def preload(self) -> None:
+        """
+        Load utilities data ahead of the first request
+        
+        Failures are logged rather than raised so the application can still
+        start; the data is then loaded on the first lookup instead.
+        """
+        try:
+            await self._ensure_utilities_loaded()
+        except Exception as error:
+            logger.warning(
+                "Utilities data preload failed, will load on demand: %s", error
+            )
 
     async def get_utility_by_zip_code(self, zip_code: str) -> UtilityCompany:
         """
@@ -50,14 +95,13 @@ class UtilityService:
             normalized_zip = self._normalize_zip_code(zip_code)
             
             # Load utilities data if not cached
-            if self._utilities_cache is None:
-                await self._load_utilities_data()
+            await self._ensure_utilities_loaded()
             
             # Look up utility company by zip code
-            utility_name = self._utilities_cache.get(normalized_zip)
+            utility_name = self._lookup_utility_name(normalized_zip)
             
             if not utility_name:
-                logger.warning(f"No utility company found for zip code: {normalized_zip}")
+                logger.warning("No utility company found for zip code: %s", normalized_zip)
                 # Return a default/unknown utility company
                 return UtilityCompany(
                     name="Unknown Utility Company",
@@ -71,9 +115,43 @@ class UtilityService:
             )
             
         except Exception as error:
-            logger.error(f"Error retrieving utility company: {error}")
+            logger.error("Error retrieving utility company: %s", error)
             raise Exception(f"Failed to retrieve utility company: {str(error)}")
 
+    async def _ensure_utilities_loaded(self) -> None:
+        """
+        Load utilities data if it is not cached yet or has gone stale
+        
+        Concurrent callers on a cold cache wait on a single load instead of
+        each downloading the file from S3.
+        """
+        if self._zip_codes is None or self._is_cache_stale():
+            async with self._load_lock:
+                # Another request may have loaded the data while we waited
+                if self._zip_codes is None or self._is_cache_stale():
+                    await self._load_utilities_data()
+
+    def _is_cache_stale(self) -> bool:
+        """
+        Check whether the cached data should be reloaded
+        
+        The cache expires after local_cache_ttl seconds. With a local mirror,
+        it is also stale once the mirror has been rewritten or removed, which
+        is how a reload or clear in one worker reaches the other workers.
+        """
+        if time.monotonic() - self._loaded_at > self.local_cache_ttl:
+            return True
+        if self.local_cache_path:
+            return self._mirror_mtime() != self._loaded_mirror_mtime
+        return False
+
+    def _mirror_mtime(self) -> Optional[float]:
+        """Return the local mirror's modification time, or None if missing"""
+        try:
+            return os.path.getmtime(self.local_cache_path)
+        except OSError:
+            return None
+
     async def _load_utilities_data(self) -> None:
         """
         Load utilities data from S3 and cache it
@@ -91,32 +169,167 @@ class UtilityService:
         ]
         """
         try:
-            self._utilities_cache = {}
-            utilities_data = await self.s3_service.read_json_file(
-                self.utilities_file_key
-            )
-            
-            logger.info(f"Utilities data: {utilities_data}")
-            # Validate that we have a dictionary
-            if not isinstance(utilities_data, list):
-                logger.error("Utilities data is not in expected format (list)")
-                self._utilities_cache = None
-                return
+            utilities_by_zip: Dict[str, str] = {}
+            utility_records = await self._read_utilities_file()
+            self._loaded_at = time.monotonic()
+            if self.local_cache_path:
+                self._loaded_mirror_mtime = self._mirror_mtime()
+
+            logger.info("Utilities data: %s", utility_records)
 
-            for entry in utilities_data:
+            for record in utility_records:
                 # ignore utilities 
-                if entry["button_label"] in ALLOWED_UTILITY_COS:
-                    self._utilities_cache[entry["post_code"]] = entry["button_label"]
+                if record.button_label not in ALLOWED_UTILITY_COS:
+                    continue
+                if record.post_code is None:
+                    continue
+                # Numeric post codes lose their leading zeros in JSON
+                if isinstance(record.post_code, int):
+                    post_code = str(record.post_code).zfill(5)
+                else:
+                    post_code = record.post_code
+                utilities_by_zip[post_code] = record.button_label
+
+            # Store as parallel sorted lists for compact binary-search lookup
+            self._zip_codes = sorted(utilities_by_zip)
+            self._utility_names = [utilities_by_zip[zip_code] for zip_code in self._zip_codes]
             logger.info(
-                f"Loaded {len(self._utilities_cache)} utility companies from S3"
+                "Loaded %s utility companies from S3", len(self._zip_codes)
             )
-            
+
         except Exception as error:
-            logger.error(f"Error loading utilities data: {error}")
-            # Set empty cache to avoid repeated failed loads
-            self._utilities_cache = None
+            logger.error("Error loading utilities data: %s", error)
+            # Reset the cache so the next request retries the load
+            self._zip_codes = None
+            self._utility_names = None
             raise Exception(f"Failed to load utilities data: {str(error)}")
 
+    async def _read_utilities_file(self) -> List[UtilityRecord]:
+        """
+        Read the utilities JSON file, preferring a fresh local mirror over S3
+        
+        Returns:
+            Decoded utility records
+            
+        Raises:
+            Exception: If the file doesn't exist or is not in the expected format
+        """
+        if not self._bypass_local_cache:
+            records = await asyncio.to_thread(self._read_local_cache)
+            if records is not None:
+                return records
+        
+        content = await self.s3_service.read_file(self.utilities_file_key)
+        if content is None:
+            raise Exception(f"Utilities file not found: {self.utilities_file_key}")
+        
+        records = self._decode_utility_records(content)
+        
+        # Only mirror content that decoded successfully
+        await asyncio.to_thread(self._write_local_cache, content)
+        self._bypass_local_cache = False
+        return records
+
+    def _read_local_cache(self) -> Optional[List[UtilityRecord]]:
+        """
+        Decode the local utilities mirror if it exists and is within its TTL
+        
+        The file is memory-mapped and decoded in place, so it is never copied
+        into a Python bytes object and workers share its pages in the OS cache.
+        
+        Returns:
+            Decoded utility records, or None if the mirror is disabled,
+            missing, stale or unreadable
+        """
+        if not self.local_cache_path:
+            return None
+        
+        try:
+            age = time.time() - os.path.getmtime(self.local_cache_path)
+            if age > self.local_cache_ttl:
+                return None
+            
+            with open(self.local_cache_path, "rb") as cache_file:
+                with mmap.mmap(
+                    cache_file.fileno(), 0, access=mmap.ACCESS_READ
+                ) as mapped:
+                    records = self._decode_utility_records(mapped)
+            
+            logger.info("Read utilities data from %s", self.local_cache_path)
+            return records
+            
+        except (OSError, ValueError):
+            # Missing or empty file
+            return None
+        except msgspec.DecodeError as error:
+            logger.warning("Ignoring invalid local utilities cache: %s", error)
+            return None
+
+    def _decode_utility_records(self, content: Any) -> List[UtilityRecord]:
+        """
+        Decode the utilities JSON file, skipping rows that are not valid records
+        
+        The array is split into raw rows first and each row is decoded on its
+        own, so one bad row does not fail the whole file.
+        
+        Args:
+            content: Bytes-like JSON content
+            
+        Returns:
+            Decoded utility records
+            
+        Raises:
+            msgspec.DecodeError: If the content is not a JSON array
+        """
+        records: List[UtilityRecord] = []
+        skipped = 0
+        for raw_row in msgspec.json.decode(content, type=List[msgspec.Raw]):
+            try:
+                records.append(msgspec.json.decode(raw_row, type=UtilityRecord))
+            except msgspec.ValidationError:
+                skipped += 1
+        
+        if skipped:
+            logger.warning("Skipped %s malformed rows in utilities data", skipped)
+        return records
+
+    def _write_local_cache(self, content: bytes) -> None:
+        """
+        Mirror the utilities file to local disk for faster cold starts
+        
+        Args:
+            content: Raw utilities file contents
+        """
+        if not self.local_cache_path:
+            return
+        
+        try:
+            os.makedirs(os.path.dirname(self.local_cache_path) or ".", exist_ok=True)
+            
+            # Write to a temporary file first so readers never see a partial file
+            temp_path = f"{self.local_cache_path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as cache_file:
+                cache_file.write(content)
+            os.replace(temp_path, self.local_cache_path)
+            
+        except OSError as error:
+            logger.warning("Failed to write local utilities cache: %s", error)
+
+    def _lookup_utility_name(self, zip_code: str) -> Optional[str]:
+        """
+        Binary search the cached zip codes for a utility company name
+        
+        Args:
+            zip_code: Normalized 5-digit zip code
+            
+        Returns:
+            Utility company name, or None if the zip code is not cached
+        """
+        index = bisect_left(self._zip_codes, zip_code)
+        if index < len(self._zip_codes) and self._zip_codes[index] == zip_code:
+            return self._utility_names[index]
+        return None
+
     def _normalize_zip_code(self, zip_code: str) -> str:
         """
         Normalize zip code to 5 digits
@@ -127,11 +340,24 @@ class UtilityService:
         Returns:
             5-digit zip code string
         """
-        # Remove any spaces or hyphens and take first 5 digits
-        cleaned = zip_code.replace("-", "").replace(" ", "")
-        return cleaned[:5]
+        # Remove any non-digit characters and take first 5 digits
+        return NON_DIGIT_PATTERN.sub("", zip_code)[:5]
 
     def clear_cache(self) -> None:
-        """Clear the utilities cache to force reload on next request"""
-        self._utilities_cache = None
+        """
+        Clear the utilities cache to force reload from S3 on next request
+        
+        The local mirror is removed as well, so the other workers sharing it
+        see the change and reload on their next request.
+        """
+        self._zip_codes = None
+        self._utility_names = None
+        self._bypass_local_cache = True
+        if self.local_cache_path:
+            try:
+                os.remove(self.local_cache_path)
+            except FileNotFoundError:
+                pass
+            except OSError as error:
+                logger.warning("Failed to remove local utilities cache: %s", error)
         logger.info("Utilities cache cleared")
\ No newline at end of file
@@ -0,0 +1,206 @@
+"""
+Tests for batch address validation in GeocodingService
+"""
+import httpx
+import pytest
+from models.schemas import AddressValidationRequest
+from services.geocoding_service import GEOCODING_CACHE_TTL, GeocodingService
+
+BATCH_RESPONSE = (
+    '"0","1 Main St, Ventnor, NJ, 08406","Match","Exact",'
+    '"1 MAIN ST, VENTNOR CITY, NJ, 08406","-74.47,39.34","123","L"\n'
+    '"1","2 Nowhere Rd, Ventnor, NJ, 08406","No_Match"\n'
+    '"2","3 Oak Ave, Ventnor, NJ, 08406","Tie"\n'
+)
+
+ONELINE_RESPONSE = {
+    "result": {
+        "addressMatches": [
+            {
+                "matchedAddress": "3 OAK AVE, VENTNOR CITY, NJ, 08406",
+                "coordinates": {"x": -74.48, "y": 39.35}
+            }
+        ]
+    }
+}
+
+
+def make_request(address: str) -> AddressValidationRequest:
+    return AddressValidationRequest(
+        address=address, city="Ventnor", state="NJ", zipCode="08406"
+    )
+
+
+def test_parse_census_batch_response():
+    matches, no_matches = GeocodingService()._parse_census_batch_response(
+        BATCH_RESPONSE
+    )
+
+    assert set(matches) == {0}
+    matched_address, coordinates = matches[0]
+    assert matched_address == "1 MAIN ST, VENTNOR CITY, NJ, 08406"
+    assert coordinates.latitude == 39.34
+    assert coordinates.longitude == -74.47
+    assert no_matches == {1}
+
+
+def test_parse_census_batch_response_skips_malformed_rows():
+    content = '"0","1 Main St","Match","Exact","1 MAIN ST","not-coordinates"\n'
+
+    matches, no_matches = GeocodingService()._parse_census_batch_response(content)
+
+    assert matches == {}
+    assert no_matches == set()
+
+
+@pytest.mark.asyncio
+async def test_validate_addresses_resolves_ties_and_uses_cache():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path.endswith("/addressbatch"):
+            return httpx.Response(200, text=BATCH_RESPONSE)
+        return httpx.Response(200, json=ONELINE_RESPONSE)
+
+    service = GeocodingService()
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    requests = [
+        make_request("1 Main St"),
+        make_request("2 Nowhere Rd"),
+        make_request("3 Oak Ave")
+    ]
+
+    results = await service.validate_addresses(requests)
+
+    assert [result.is_valid for result in results] == [True, False, True]
+    assert results[2].matched_address == "3 OAK AVE, VENTNOR CITY, NJ, 08406"
+    assert len(calls) == 2
+
+    await service.validate_addresses(requests)
+    assert len(calls) == 2
+    await service.shutdown()
+
+
+
+@pytest.mark.asyncio
+async def test_missing_and_malformed_batch_rows_are_not_cached_as_no_match():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path.endswith("/addressbatch"):
+            # Row 0 has unparseable coordinates and row 1 is missing entirely
+            return httpx.Response(
+                200,
+                text='"0","1 Main St","Match","Exact","1 MAIN ST","bad"\n'
+            )
+        return httpx.Response(200, json=ONELINE_RESPONSE)
+
+    service = GeocodingService()
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    results = await service.validate_addresses([
+        make_request("1 Main St"),
+        make_request("2 Elm St")
+    ])
+
+    assert [result.is_valid for result in results] == [True, True]
+    assert calls.count("/geocoder/locations/onelineaddress") == 2
+    await service.shutdown()
+
+
+NO_MATCH_RESPONSE = {"result": {"addressMatches": []}}
+
+
+def make_service(handler) -> GeocodingService:
+    service = GeocodingService()
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return service
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_skips_census_call():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json=ONELINE_RESPONSE)
+
+    service = make_service(handler)
+
+    first = await service.validate_address("3 Oak Ave", "Ventnor", "NJ", "08406")
+    second = await service.validate_address("3 OAK AVE ", "ventnor", "nj", "08406-1234")
+
+    assert len(calls) == 1
+    assert second == first
+    await service.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cached_no_match_uses_current_callers_address():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json=NO_MATCH_RESPONSE)
+
+    service = make_service(handler)
+
+    await service.validate_address("1 main st", "ventnor", "nj", "08406-1111")
+    result = await service.validate_address("1 MAIN ST ", "Ventnor", "NJ", "08406-2222")
+
+    assert len(calls) == 1
+    assert result.is_valid is False
+    assert result.matched_address == "1 MAIN ST , Ventnor, NJ 08406-2222"
+    await service.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_expired_entry_is_refetched(monkeypatch):
+    calls = []
+    now = [1000.0]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json=ONELINE_RESPONSE)
+
+    monkeypatch.setattr(
+        "services.geocoding_service.time.monotonic", lambda: now[0]
+    )
+    service = make_service(handler)
+
+    await service.validate_address("3 Oak Ave", "Ventnor", "NJ", "08406")
+    now[0] += GEOCODING_CACHE_TTL + 1
+    await service.validate_address("3 Oak Ave", "Ventnor", "NJ", "08406")
+
+    assert len(calls) == 2
+    await service.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_entry_is_evicted():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.params["address"])
+        return httpx.Response(200, json=ONELINE_RESPONSE)
+
+    service = make_service(handler)
+    service.cache_max_size = 2
+
+    await service.validate_address("1 A St", "Ventnor", "NJ", "08406")
+    await service.validate_address("2 B St", "Ventnor", "NJ", "08406")
+    # Touch the first entry so the second becomes least recently used
+    await service.validate_address("1 A St", "Ventnor", "NJ", "08406")
+    await service.validate_address("3 C St", "Ventnor", "NJ", "08406")
+    await service.validate_address("1 A St", "Ventnor", "NJ", "08406")
+    await service.validate_address("2 B St", "Ventnor", "NJ", "08406")
+
+    assert calls == [
+        "1 A St, Ventnor, NJ 08406",
+        "2 B St, Ventnor, NJ 08406",
+        "3 C St, Ventnor, NJ 08406",
+        "2 B St, Ventnor, NJ 08406"
+    ]
+    await service.shutdown()
@@ -0,0 +1,113 @@
+"""
+Tests for the batched append path of S3Service
+"""
+import asyncio
+import pytest
+from services.s3_service import S3Service
+
+
+class FakeS3Client:
+    """Minimal stand-in for the aioboto3 S3 client"""
+
+    def __init__(self, fail: bool = False, failures: int = 0):
+        self.fail = fail
+        self.failures = failures
+        self.put_calls = []
+
+    async def put_object(self, **kwargs):
+        self.put_calls.append(kwargs)
+        if self.fail or len(self.put_calls) <= self.failures:
+            raise Exception("S3 unavailable")
+
+
+def make_service(
+    client: FakeS3Client,
+    flush_interval: float = 10.0,
+    spool_dir: str = None
+) -> S3Service:
+    service = S3Service(
+        bucket_name="test-bucket",
+        flush_interval=flush_interval,
+        spool_dir=spool_dir
+    )
+    service.s3_client = client
+    return service
+
+
+@pytest.mark.asyncio
+async def test_shutdown_writes_batch_held_by_flush_task():
+    client = FakeS3Client()
+    service = make_service(client)
+    await service.startup()
+
+    await service.append_json_line("subscribers", {"name": "Ada"})
+    # Give the flush task time to take the item off the queue
+    await asyncio.sleep(0.1)
+    await service.shutdown()
+
+    assert len(client.put_calls) == 1
+    assert client.put_calls[0]["Body"] == b'{"name":"Ada"}\n'
+    assert client.put_calls[0]["Key"].startswith("subscribers/")
+
+
+@pytest.mark.asyncio
+async def test_cancelled_flush_task_requeues_its_batch():
+    client = FakeS3Client()
+    service = make_service(client)
+    await service.startup()
+
+    await service.append_json_line("subscribers", {"name": "Ada"})
+    await asyncio.sleep(0.1)
+    service._flush_task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await service._flush_task
+    service._flush_task = None
+
+    await service.flush()
+
+    assert len(client.put_calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_items_are_retried_until_written():
+    client = FakeS3Client(failures=6)
+    service = make_service(client, flush_interval=0.001)
+    await service.startup()
+
+    await service.append_json_line("subscribers", {"name": "Ada"})
+    await asyncio.sleep(0.5)
+
+    assert len(client.put_calls) == 7
+    assert service._queue.empty()
+    await service.shutdown()
+    assert len(client.put_calls) == 7
+
+
+@pytest.mark.asyncio
+async def test_unsent_items_are_spooled_and_replayed(tmp_path):
+    failing = make_service(FakeS3Client(fail=True), flush_interval=0.01, spool_dir=str(tmp_path))
+    await failing.startup()
+    await failing.append_json_line("subscribers", {"name": "Ada"})
+    await asyncio.sleep(0.05)
+    await failing.shutdown()
+
+    assert len(list(tmp_path.glob("*.ndjson"))) == 1
+
+    client = FakeS3Client()
+    service = make_service(client, spool_dir=str(tmp_path))
+    await service.startup()
+    await service.shutdown()
+
+    assert len(client.put_calls) == 1
+    assert client.put_calls[0]["Body"] == b'{"name":"Ada"}\n'
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_append_without_prefix_raises_before_queueing():
+    service = make_service(FakeS3Client())
+
+    with pytest.raises(ValueError):
+        await service.append_json_line(None, {"name": "Ada"})
+
+    assert service._queue.empty()
@@ -0,0 +1,126 @@
+"""
+Tests for UtilityService loading and caching
+"""
+import asyncio
+import pytest
+from services.utility_service import UtilityService
+
+
+class FakeS3Service:
+    """Serves utilities file content from memory and counts reads"""
+
+    def __init__(self, content: bytes):
+        self.content = content
+        self.reads = 0
+
+    async def read_file(self, file_key: str):
+        self.reads += 1
+        await asyncio.sleep(0.01)
+        return self.content
+
+
+ACE_FILE = b'[{"button_label": "ACE", "post_code": "08403"}]'
+PSEG_FILE = b'[{"button_label": "PSE&G", "post_code": "08403"}]'
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_share_one_load(tmp_path):
+    s3_service = FakeS3Service(ACE_FILE)
+    service = UtilityService(
+        s3_service, "utilities.json", local_cache_path=str(tmp_path / "u.json")
+    )
+
+    results = await asyncio.gather(
+        *[service.get_utility_by_zip_code("08403-1234") for _ in range(5)]
+    )
+
+    assert [result.name for result in results] == ["ACE"] * 5
+    assert s3_service.reads == 1
+
+
+@pytest.mark.asyncio
+async def test_clear_cache_reloads_from_s3_not_local_mirror(tmp_path):
+    s3_service = FakeS3Service(ACE_FILE)
+    service = UtilityService(
+        s3_service, "utilities.json", local_cache_path=str(tmp_path / "u.json")
+    )
+    assert (await service.get_utility_by_zip_code("08403")).name == "ACE"
+
+    s3_service.content = PSEG_FILE
+    service.clear_cache()
+
+    assert (await service.get_utility_by_zip_code("08403")).name == "PSE&G"
+    assert s3_service.reads == 2
+    assert (tmp_path / "u.json").read_bytes() == PSEG_FILE
+
+
+@pytest.mark.asyncio
+async def test_invalid_s3_content_is_not_mirrored(tmp_path):
+    mirror = tmp_path / "u.json"
+    service = UtilityService(
+        FakeS3Service(b"not json"), "utilities.json", local_cache_path=str(mirror)
+    )
+
+    with pytest.raises(Exception):
+        await service.get_utility_by_zip_code("08403")
+
+    assert not mirror.exists()
+
+
+@pytest.mark.asyncio
+async def test_malformed_rows_do_not_fail_the_load():
+    content = (
+        b'[{"button_label": null, "post_code": "08002"},'
+        b' {"button_label": "ACE", "post_code": 8403},'
+        b' {"button_label": "JCP&L"}]'
+    )
+    service = UtilityService(FakeS3Service(content), "utilities.json")
+
+    result = await service.get_utility_by_zip_code("08403")
+
+    assert result.name == "ACE"
+    assert result.zip_code == "08403"
+
+
+@pytest.mark.asyncio
+async def test_invalid_rows_are_skipped_from_s3_and_mirror(tmp_path):
+    content = (
+        b'["junk", null, {"button_label": 5}, {"post_code": 8403.0},'
+        b' {"button_label": "ACE", "post_code": "08403"}]'
+    )
+    mirror = str(tmp_path / "u.json")
+    s3_service = FakeS3Service(content)
+    from_s3 = UtilityService(s3_service, "utilities.json", local_cache_path=mirror)
+    from_mirror = UtilityService(s3_service, "utilities.json", local_cache_path=mirror)
+
+    assert (await from_s3.get_utility_by_zip_code("08403")).name == "ACE"
+    assert (await from_mirror.get_utility_by_zip_code("08403")).name == "ACE"
+    assert s3_service.reads == 1
+
+
+@pytest.mark.asyncio
+async def test_clear_in_one_worker_reloads_other_workers(tmp_path):
+    mirror = str(tmp_path / "u.json")
+    s3_service = FakeS3Service(ACE_FILE)
+    worker_a = UtilityService(s3_service, "utilities.json", local_cache_path=mirror)
+    worker_b = UtilityService(s3_service, "utilities.json", local_cache_path=mirror)
+    assert (await worker_a.get_utility_by_zip_code("08403")).name == "ACE"
+    assert (await worker_b.get_utility_by_zip_code("08403")).name == "ACE"
+
+    s3_service.content = PSEG_FILE
+    worker_a.clear_cache()
+
+    assert (await worker_b.get_utility_by_zip_code("08403")).name == "PSE&G"
+    assert (await worker_a.get_utility_by_zip_code("08403")).name == "PSE&G"
+
+
+@pytest.mark.asyncio
+async def test_cache_without_mirror_expires_after_ttl():
+    s3_service = FakeS3Service(ACE_FILE)
+    service = UtilityService(s3_service, "utilities.json", local_cache_ttl=0.05)
+    assert (await service.get_utility_by_zip_code("08403")).name == "ACE"
+
+    s3_service.content = PSEG_FILE
+    await asyncio.sleep(0.1)
+
+    assert (await service.get_utility_by_zip_code("08403")).name == "PSE&G"
@@ -2,7 +2,7 @@
 import React, { useState } from 'react';
 import { FormInput } from './common/FormInput';
 import { Button } from './common/Button';
-import { validateAddress, getUtilityCompanyByZipCode } from '../services/api';
+import { resolveAddress } from '../services/api';
 import type { UserFormData } from '../types';
 
 interface HomePageProps {
@@ -92,18 +92,16 @@ export const HomePage: React.FC<HomePageProps> = ({ onFormSubmitSuccess }) => {
     setIsSubmitting(true);
 
     try {
-      // Step 1: Validate address with Census Bureau Geocoding API
-      const geocodingResponse = await validateAddress(
+      // Step 1: Validate address with Census Bureau Geocoding API and
+      // get utility company information from S3 in a single request
+      const { geocoding: geocodingResponse, utilityCompany } = await resolveAddress(
         formData.address,
         formData.city,
         formData.state,
         formData.zipCode
       );
 
-      // Step 2: Get utility company information from S3
-      const utilityCompany = await getUtilityCompanyByZipCode(formData.zipCode);
-
-      // Step 3: Navigate to confirmation page with data
+      // Step 2: Navigate to confirmation page with data
       onFormSubmitSuccess({
         userInfo: formData,
         recommendedAddress: geocodingResponse.matchedAddress,
@@ -1,5 +1,6 @@
 // API service layer for communicating with the backend
 import type {  
+  AddressResolutionResponse,
   GeocodingApiResponse, 
   UtilityCompany, 
   ConfirmationData 
@@ -58,9 +59,35 @@ export async function getUtilityCompanyByZipCode(
   return response.json();
 }
 
+/**
+ * Validates an address and retrieves its utility company in a single request
+ * The backend runs both lookups in parallel
+ */
+export async function resolveAddress(
+  address: string,
+  city: string,
+  state: string,
+  zipCode: string
+): Promise<AddressResolutionResponse> {
+  const response = await fetch(`${API_BASE_URL}/api/resolve`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+    },
+    body: JSON.stringify({ address, city, state, zipCode }),
+  });
+
+  if (!response.ok) {
+    const errorData = await response.json();
+    throw new Error(errorData.message || 'Failed to resolve address');
+  }
+
+  return response.json();
+}
+
 /**
  * Submits confirmed user information to be stored in AWS S3
- * Appends data to the subscriber_info.json file
+ * Appends data as newline-delimited JSON under the subscriber key prefix
  */
 export async function submitSubscriberInformation(
   confirmationData: ConfirmationData
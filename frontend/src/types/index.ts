@@ -21,6 +21,11 @@ export interface UtilityCompany {
   zipCode: string;
 }
 
+export interface AddressResolutionResponse {
+  geocoding: GeocodingApiResponse;
+  utilityCompany: UtilityCompany;
+}
+
 export interface AssistanceProgram {
   value: 'SNAP' | 'Medicare' | 'None';
   label: string;